@@ -0,0 +1,97 @@
+import os
+import timeit
+import tracemalloc
+from contextlib import redirect_stdout
+
+from src.compiler import CADCompiler
+from typing import Any, List
+
+from pydantic import BaseModel
+
+from src.custom_types import Feature, MetaInfo, PartInfo, ReferenceGeometry
+
+# Times CADCompiler.compile() and CADCompiler.run() (mock mode) against the
+# pre-plan baseline code for the same entry points. The LLM call is replaced
+# by a canned D-File and mock logging goes to os.devnull.
+
+SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def make_d_file(n_features: int) -> dict:
+    features = []
+    for i in range(n_features // 2):
+        sketch = {"id": f"sketch_{i}", "type": "sketch", "sketch_plane": "XY"}
+        if i % 2:
+            sketch["parameters"] = {"circle": {"center": [i, 0], "radius": 5}}
+        else:
+            sketch["parameters"] = {"rectangle": {"center": [0, i], "width": 10, "height": 4}}
+        features.append(sketch)
+        features.append({
+            "id": f"pad_{i}", "type": "pad", "sketch": f"sketch_{i}",
+            "parameters": {"length": 20, "direction": "Z"}
+        })
+    return {
+        "meta": {"cad_system": "CATIA_V5", "units": "mm", "design_mode": "parametric"},
+        "part": {"name": "bench", "origin": [0, 0, 0], "axis_system": "default"},
+        "features": features,
+        "update_order": [f["id"] for f in features],
+    }
+
+
+# --- Baseline (before the execution plan) ---
+
+class BaselineDFile(BaseModel):
+    # DFile as it was: untyped Feature.parameters, no reference checks
+    meta: MetaInfo
+    part: PartInfo
+    reference_geometry: ReferenceGeometry = ReferenceGeometry()
+    features: List[Feature]
+    relations: List[Any] = []
+    constraints: List[Any] = []
+    update_order: List[str] = []
+
+
+def baseline_compile(raw: dict) -> dict:
+    return BaselineDFile(**raw).dict()
+
+
+def baseline_run(d_file_dict: dict):
+    d_file = BaselineDFile(**d_file_dict)
+    feature_map = {f.id: f for f in d_file.features}
+    ordered = [feature_map[fid] for fid in d_file.update_order if fid in feature_map]
+    for feature in ordered:
+        print(f"[MOCK] Executing Feature: {feature.type} (ID: {feature.id}) Params: {feature.parameters}")
+
+
+def measure(fn, arg, repeat: int):
+    # Best of `repeat` runs; the first run doubles as warm-up
+    best = min(timeit.repeat(lambda: fn(arg), number=1, repeat=repeat))
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1e3, peak / 2**20
+
+
+def main():
+    with redirect_stdout(open(os.devnull, "w")):
+        compiler = CADCompiler()
+
+    print(f"{'features':>9} {'entry':>8} | {'baseline ms':>11} {'MiB':>7} | {'plan ms':>9} {'MiB':>7}")
+    for n in SIZES:
+        raw = make_d_file(n)
+        compiler.llm.generate_d_file = lambda prompt: raw
+        repeat = 3 if n >= 100000 else 7
+        rows = [
+            ("compile", baseline_compile, raw, compiler.compile, "bench"),
+            ("run", baseline_run, raw, compiler.run, raw),
+        ]
+        for entry, base_fn, base_arg, new_fn, new_arg in rows:
+            with redirect_stdout(open(os.devnull, "w")):
+                base_ms, base_mib = measure(base_fn, base_arg, repeat)
+                new_ms, new_mib = measure(new_fn, new_arg, repeat)
+            print(f"{n:>9} {entry:>8} | {base_ms:>11.2f} {base_mib:>7.2f} | {new_ms:>9.2f} {new_mib:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
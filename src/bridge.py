@@ -1,4 +1,6 @@
-from .custom_types import DFile, Feature
+from .custom_types import DFile
+from .planner import ExecutionPlan, SketchStep, SolidStep, PlaneOffsetStep, compile_plan
+from typing import Optional
 import traceback
 
 class CatiaBridge:
@@ -8,6 +10,7 @@ class CatiaBridge:
         self.part = None
         self.hsf = None # HybridShapeFactory
         self.sf = None  # ShapeFactory (Solid)
+        self.step_objects = [] # CATIA objects created per plan step
         
         if self.mode == "real":
             try:
@@ -26,36 +29,43 @@ class CatiaBridge:
                 print(f"CATIA connection failed: {e}. Falling back to Mock mode.")
                 self.mode = "mock"
 
-    def execute(self, d_file: DFile):
-        print(f"--- Executing D-File: {d_file.part.name} [{self.mode.upper()}] ---")
-        
-        ordered_features = d_file.features
-        if d_file.update_order:
-             feature_map = {f.id: f for f in d_file.features}
-             ordered_features = [feature_map[fid] for fid in d_file.update_order if fid in feature_map]
+    def execute(self, plan: ExecutionPlan):
+        # Accept a validated DFile for backwards compatibility
+        if isinstance(plan, DFile):
+            plan = compile_plan(plan)
+
+        print(f"--- Executing D-File: {plan.part_name} [{self.mode.upper()}] ---")
+
+        # CATIA objects created per step, indexed like plan.steps
+        self.step_objects = [None] * len(plan.steps)
 
         execution_log = []
-        for feature in ordered_features:
-            result = self.execute_feature(feature)
+        for index, step in enumerate(plan.steps):
+            result = self.execute_feature(step, index)
             if result:
                 execution_log.append(result)
             
+        # Standalone execute_feature() calls look sketches up by name
+        self.step_objects = []
+
         if self.mode == "real":
             self.part.update()
         
         return execution_log
 
-    def execute_feature(self, feature: Feature):
+    def execute_feature(self, feature, index: Optional[int] = None):
         if self.mode == "mock":
-            print(f"[MOCK] Executing Feature: {feature.type} (ID: {feature.id}) Params: {feature.parameters}")
+            params = {k: v for k, v in feature._asdict().items() if k not in ("id", "type") and v is not None}
+            print(f"[MOCK] Executing Feature: {feature.type} (ID: {feature.id}) Params: {params}")
             return None
 
         # REAL IMPLEMENTATION STUBS
         try:
+            created = None
             if feature.type == "sketch":
-                self._create_sketch(feature)
+                created = self._create_sketch(feature)
             elif feature.type == "pad":
-                self._create_pad(feature)
+                created = self._create_pad(feature)
             elif feature.type == "pocket":
                 self._create_pocket(feature)
             elif feature.type == "plane_offset":
@@ -63,6 +73,8 @@ class CatiaBridge:
             else:
                 print(f"Warning: Feature type {feature.type} not ready for real execution.")
                 return f"Skipped {feature.id} (not implemented)"
+            if index is not None:
+                self.step_objects[index] = created
         except Exception as e:
             msg = f"Error executing feature {feature.id}: {e}"
             print(msg)
@@ -70,11 +82,11 @@ class CatiaBridge:
             return msg
         return None
 
-    def _create_sketch(self, feature: Feature):
+    def _create_sketch(self, feature: SketchStep):
         try:
             # 1. Resolve Sketch Plane
             # For MVP, simple mapping of strings to absolute planes
-            plane_name = feature.sketch_plane
+            plane_name = feature.plane
             reference = None
             
             origin_elements = self.part.origin_elements
@@ -103,76 +115,51 @@ class CatiaBridge:
             sketch.open_edition()
             
             # 4. Draw Geometry
-            params = feature.parameters
-            
-            if "circle" in params and params["circle"]:
-                c_params = params["circle"]
-                # JSON is [x, y], CATIA needs separate args
+            # Coordinates are pre-cast floats from the ExecutionPlan
+            if feature.circle:
+                c = feature.circle
                 # CreateCircle(CenterX, CenterY, Radius, StartAngle, EndAngle)
-                # Note: PyCATIA usually wraps these. 
-                # Raw COM check: Factory2D.CreateCircle(x, y, r, 0, 0) -> Circle2D
-                # But we might need to cast input to float
-                cx, cy = float(c_params["center"][0]), float(c_params["center"][1])
-                radius = float(c_params["radius"])
-                circle = factory_2d.create_circle(cx, cy, radius, 0, 6.2831853)
-                # circle.center_point = ... (automatic in create)
+                factory_2d.create_circle(c.cx, c.cy, c.radius, 0, 6.2831853)
                 
-            if "line" in params and params["line"]:
-                l_params = params["line"]
-                p1 = l_params["start"]
-                p2 = l_params["end"]
-                factory_2d.create_line(float(p1[0]), float(p1[1]), float(p2[0]), float(p2[1]))
+            if feature.line:
+                l = feature.line
+                factory_2d.create_line(l.x1, l.y1, l.x2, l.y2)
                 
-            if "rectangle" in params and params["rectangle"]:
-                r = params["rectangle"]
-                # Support Center + Width + Height
-                if "center" in r and "width" in r and "height" in r:
-                    cx, cy = float(r["center"][0]), float(r["center"][1])
-                    w, h = float(r["width"]), float(r["height"])
-                    
-                    x_min = cx - w/2
-                    x_max = cx + w/2
-                    y_min = cy - h/2
-                    y_max = cy + h/2
-                    
-                    # p1(bl) -> p2(br) -> p3(tr) -> p4(tl)
-                    # Line 1: Bottom
-                    factory_2d.create_line(x_min, y_min, x_max, y_min)
-                    # Line 2: Right
-                    factory_2d.create_line(x_max, y_min, x_max, y_max)
-                    # Line 3: Top
-                    factory_2d.create_line(x_max, y_max, x_min, y_max)
-                    # Line 4: Left
-                    factory_2d.create_line(x_min, y_max, x_min, y_min)
+            if feature.rectangle:
+                # Extents are normalized from center/width/height or corner1/corner2
+                x_min, y_min, x_max, y_max = feature.rectangle
                 
-                # Support Corner1 + Corner2
-                elif "corner1" in r and "corner2" in r:
-                    # Implement if needed, but LLM usually prefers center/width
-                    pass
+                # p1(bl) -> p2(br) -> p3(tr) -> p4(tl)
+                # Line 1: Bottom
+                factory_2d.create_line(x_min, y_min, x_max, y_min)
+                # Line 2: Right
+                factory_2d.create_line(x_max, y_min, x_max, y_max)
+                # Line 3: Top
+                factory_2d.create_line(x_max, y_max, x_min, y_max)
+                # Line 4: Left
+                factory_2d.create_line(x_min, y_max, x_min, y_min)
 
             # 5. Close Edition
             sketch.close_edition()
             self.part.update()
             print(f"Created Sketch: {feature.id}")
+            return sketch
 
         except Exception as e:
             print(f"Failed to create sketch: {e}")
             traceback.print_exc()
             raise e
 
-    def _create_pad(self, feature: Feature):
+    def _create_pad(self, feature: SolidStep):
         try:
             # 1. Find Profile (Sketch)
-            sketch_id = feature.sketch
-            
+            # The plan guarantees the sketch step ran before this one
             target_sketch = None
-            try:
-                # Search in Main Body Sketches
-                main_body = self.part.main_body
-                target_sketch = main_body.sketches.item(sketch_id)
-            except:
-                print(f"Could not find sketch {sketch_id} in Main Body")
-                return
+            if feature.sketch_index < len(self.step_objects):
+                target_sketch = self.step_objects[feature.sketch_index]
+            if target_sketch is None:
+                # Called outside execute(): search in Main Body Sketches
+                target_sketch = self.part.main_body.sketches.item(feature.sketch)
 
             # 2. PROPER REFERENCE CREATION
             # "Pad" requires a Reference to the Profile? 
@@ -180,10 +167,10 @@ class CatiaBridge:
             # sketch_ref = self.part.create_reference_from_object(target_sketch)
             
             # 3. Create Pad using ShapeFactory
-            pad = self.sf.add_new_pad(target_sketch, float(feature.parameters["length"]))
+            pad = self.sf.add_new_pad(target_sketch, feature.length)
             
             # 3b. Direction (Optional)
-            if "direction" in feature.parameters and feature.parameters["direction"] != "Z":
+            if feature.direction != "Z":
                 # For basic pads, direction is usually normal to sketch.
                 # Custom direction requires another reference (line/plane).
                 pass
@@ -191,14 +178,15 @@ class CatiaBridge:
             pad.name = feature.id
             self.part.update()
             print(f"Created Pad: {feature.id}")
+            return pad
 
         except Exception as e:
             print(f"Failed to create pad: {e}")
             traceback.print_exc()
             raise e
 
-    def _create_pocket(self, feature: Feature):
+    def _create_pocket(self, feature: SolidStep):
         pass
 
-    def _create_plane_offset(self, feature: Feature):
+    def _create_plane_offset(self, feature: PlaneOffsetStep):
         pass
@@ -1,6 +1,7 @@
 from .llm_engine import LLMEngine
 from .custom_types import DFile, ErrorResponse
 from .bridge import CatiaBridge
+from .planner import compile_plan
 import json
 from pydantic import ValidationError
 
@@ -27,10 +28,10 @@ class CADCompiler:
         if "error" in raw_result:
             return raw_result
             
-        # Validate against DFile schema
+        # Validate against DFile schema (including type-specific parameters
+        # and sketch references)
         try:
             d_file = DFile(**raw_result)
-            return d_file.dict()
         except ValidationError as e:
             return {
                 "error": "SCHEMA_VALIDATION_FAILED",
@@ -38,18 +39,21 @@ class CADCompiler:
                 "raw_output": raw_result
             }
 
+        return d_file.dict()
+
     def run(self, d_file_dict: dict, mode: str = "mock"):
         """
         Executes the D-File dict.
         """
         try:
-            d_file = DFile(**d_file_dict)
+            # Validates against DFile and compiles the execution plan
+            plan = compile_plan(d_file_dict)
             self.bridge.mode = mode
             if mode == "real":
                  # Re-init attempt for real connection if needed
                  self.bridge = CatiaBridge(mode="real")
             
-            logs = self.bridge.execute(d_file)
+            logs = self.bridge.execute(plan)
             
             # Check for errors in logs
             errors = [l for l in logs if "Error" in str(l) or "Skipped" in str(l)]
@@ -1,5 +1,6 @@
 from typing import List, Literal, Optional, Union, Dict, Any
-from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+from pydantic import BaseModel, Field, model_validator
 
 # --- Sub-models for Parameters ---
 
@@ -11,18 +12,27 @@ class Point3D(BaseModel):
 
 class CircleParams(BaseModel):
     center: List[float] = Field(..., min_items=2, max_items=2)
-    radius: float
+    radius: float = Field(..., gt=0)
 
 class LineParams(BaseModel):
     start: List[float] = Field(..., min_items=2, max_items=2)
     end: List[float] = Field(..., min_items=2, max_items=2)
 
 class RectangleParams(BaseModel):
-    center: List[float] = Field(None, min_items=2, max_items=2)
-    corner1: List[float] = Field(None, min_items=2, max_items=2)
-    corner2: List[float] = Field(None, min_items=2, max_items=2)
-    width: Optional[float] = None
-    height: Optional[float] = None
+    center: Optional[List[float]] = Field(None, min_items=2, max_items=2)
+    corner1: Optional[List[float]] = Field(None, min_items=2, max_items=2)
+    corner2: Optional[List[float]] = Field(None, min_items=2, max_items=2)
+    width: Optional[float] = Field(None, gt=0)
+    height: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_extents(self):
+        # The bridge can only draw a rectangle from one of these two forms
+        if self.center is not None and self.width is not None and self.height is not None:
+            return self
+        if self.corner1 is not None and self.corner2 is not None:
+            return self
+        raise ValueError("rectangle needs center + width + height, or corner1 + corner2")
 
 class SketchParameters(BaseModel):
     # Flattened sketch entities. Keys like "circle", "line", etc.
@@ -34,10 +44,17 @@ class SketchParameters(BaseModel):
     # Add other sketch primitives as needed
 
 class SolidParams(BaseModel):
-    length: Optional[float] = None
-    depth: Optional[float] = None # Alternative to length
+    length: Optional[float] = Field(None, gt=0)
+    depth: Optional[float] = Field(None, gt=0) # Alternative to length
     direction: Optional[str] = "Z" # Default direction
 
+    @model_validator(mode="after")
+    def check_length(self):
+        # Pad/pocket cannot be built without an extrusion length
+        if self.length is None and self.depth is None:
+            raise ValueError("length or depth is required")
+        return self
+
 class PlaneParams(BaseModel):
     reference: str
     offset: float
@@ -57,10 +74,41 @@ class Feature(BaseModel):
     # Solid-specific fields
     sketch: Optional[str] = None # Reference to a sketch feature ID
     
-    # Generic bucket for parameters, refined by type in logic if needed
-    # but we can also use specific models if we want strict validation per type
+    # Generic bucket for parameters, refined by type in the subclasses below
     parameters: Dict[str, Any] 
 
+SOLID_TYPES = frozenset(["pad", "pocket"])
+
+class SketchFeature(Feature):
+    type: Literal["sketch"]
+    parameters: SketchParameters
+
+class SolidFeature(Feature):
+    type: Literal["pad", "pocket"]
+    sketch: str
+    parameters: SolidParams
+
+class PlaneOffsetFeature(Feature):
+    type: Literal["plane_offset"]
+    parameters: PlaneParams
+
+class GenericFeature(Feature):
+    # No typed parameter schema yet
+    type: Literal["shaft", "groove", "rib", "axis", "point"]
+
+# Picked by "type", so each feature's parameters are checked in the same
+# validation pass as the rest of the D-File
+AnyFeature = Annotated[
+    Union[SketchFeature, SolidFeature, PlaneOffsetFeature, GenericFeature],
+    Field(discriminator="type")
+]
+
+def execution_order(features: List[Feature], update_order: List[str]) -> List[Feature]:
+    if not update_order:
+        return list(features)
+    feature_map = {f.id: f for f in features}
+    return [feature_map[fid] for fid in update_order if fid in feature_map]
+
 # --- Meta and Part Models ---
 
 class MetaInfo(BaseModel):
@@ -81,11 +129,37 @@ class DFile(BaseModel):
     meta: MetaInfo
     part: PartInfo
     reference_geometry: ReferenceGeometry = ReferenceGeometry()
-    features: List[Feature]
+    features: List[AnyFeature]
     relations: List[Any] = []
     constraints: List[Any] = []
     update_order: List[str] = []
 
+    @model_validator(mode="after")
+    def check_references(self):
+        features = self.features
+        positions = {f.id: i for i, f in enumerate(features)}
+        if len(positions) != len(features):
+            seen = set()
+            for i, f in enumerate(features):
+                if f.id in seen:
+                    raise ValueError(f"features[{i}].id: duplicate feature ID {f.id!r}")
+                seen.add(f.id)
+
+        # Every pad/pocket needs a sketch that runs before it
+        seen = set()
+        for f in execution_order(features, self.update_order):
+            if f.type in SOLID_TYPES:
+                target = positions.get(f.sketch)
+                if target is None or features[target].type != "sketch":
+                    raise ValueError(f"features[{positions[f.id]}].sketch: {f.sketch!r} is not a sketch feature")
+                if f.sketch not in seen:
+                    raise ValueError(f"features[{positions[f.id]}].sketch: sketch {f.sketch!r} must run before {f.id!r} in update_order")
+            seen.add(f.id)
+        return self
+
+    def ordered_features(self) -> List[Feature]:
+        return execution_order(self.features, self.update_order)
+
 class ErrorResponse(BaseModel):
     error: Literal["AMBIGUOUS_INPUT"]
     missing_parameters: List[str]
@@ -0,0 +1,156 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+from types import MappingProxyType
+from pydantic import ValidationError
+from .custom_types import DFile, SketchFeature, SOLID_TYPES
+
+# --- Compiled Execution Plan ---
+# A validated D-File is compiled into immutable tuples. DFile has already
+# checked the type-specific parameters and sketch references; here floats
+# are unpacked and references resolved to step indices, so the bridge
+# never touches the parameter models again.
+
+
+class PlanError(ValueError):
+    """
+    Raised when a D-File cannot be compiled into an ExecutionPlan.
+    errors() has the same shape as pydantic's ValidationError.errors().
+    """
+
+    def __init__(self, errors: List[Dict[str, Any]]):
+        self._errors = errors
+        super().__init__("; ".join(
+            f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" if e["loc"] else e["msg"] for e in errors
+        ))
+
+    def errors(self) -> List[Dict[str, Any]]:
+        return self._errors
+
+
+class CirclePlan(NamedTuple):
+    cx: float
+    cy: float
+    radius: float
+
+
+class LinePlan(NamedTuple):
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+class RectanglePlan(NamedTuple):
+    x_min: float
+    y_min: float
+    x_max: float
+    y_max: float
+
+
+class SketchStep(NamedTuple):
+    id: str
+    type: str
+    plane: Optional[str]
+    circle: Optional[CirclePlan]
+    line: Optional[LinePlan]
+    rectangle: Optional[RectanglePlan]
+
+
+class SolidStep(NamedTuple):
+    id: str
+    type: str
+    sketch: str
+    sketch_index: int  # Index of the referenced SketchStep in ExecutionPlan.steps
+    length: float
+    direction: str
+
+
+class PlaneOffsetStep(NamedTuple):
+    id: str
+    type: str
+    reference: str
+    offset: float
+
+
+class GenericStep(NamedTuple):
+    # Feature types without a typed schema yet (shaft, groove, rib, axis, point)
+    id: str
+    type: str
+    parameters: Any  # Read-only mapping, see _freeze
+
+
+class ExecutionPlan(NamedTuple):
+    part_name: str
+    units: str
+    steps: Tuple[Any, ...]  # In execution (update_order) order
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+# --- Step builders ---
+# Parameters are already typed and checked by DFile, so these only convert.
+
+def _sketch_step(feature: SketchFeature) -> SketchStep:
+    params = feature.parameters
+    circle = line = rectangle = None
+    if params.circle:
+        c = params.circle
+        circle = CirclePlan(c.center[0], c.center[1], c.radius)
+    if params.line:
+        l = params.line
+        line = LinePlan(l.start[0], l.start[1], l.end[0], l.end[1])
+    if params.rectangle:
+        r = params.rectangle
+        # Normalize both rectangle forms to min/max extents
+        if r.center is not None and r.width is not None and r.height is not None:
+            cx, cy = r.center
+            rectangle = RectanglePlan(cx - r.width / 2, cy - r.height / 2, cx + r.width / 2, cy + r.height / 2)
+        else:
+            (x1, y1), (x2, y2) = r.corner1, r.corner2
+            rectangle = RectanglePlan(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+    return SketchStep(feature.id, feature.type, feature.sketch_plane, circle, line, rectangle)
+
+
+# --- Plan compiler ---
+
+def compile_plan(d_file: Union[DFile, Dict[str, Any]]) -> ExecutionPlan:
+    """
+    Compiles a D-File (dict or already validated DFile) into an ExecutionPlan.
+    A dict is validated against DFile first; PlanError wraps its errors.
+    """
+    if not isinstance(d_file, DFile):
+        if not isinstance(d_file, dict):
+            raise PlanError([{"type": "plan_error", "loc": (), "msg": "expected a D-File object", "input": d_file}])
+        try:
+            d_file = DFile(**d_file)
+        except ValidationError as e:
+            raise PlanError(e.errors())
+
+    # DFile.check_references guarantees each sketch is already in `index`
+    steps = []
+    index = {}
+    for feature in d_file.ordered_features():
+        ftype = feature.type
+        if ftype == "sketch":
+            step = _sketch_step(feature)
+        elif ftype in SOLID_TYPES:
+            p = feature.parameters
+            # 'depth' is accepted as an alternative to 'length'
+            step = SolidStep(
+                feature.id, ftype, feature.sketch, index[feature.sketch],
+                p.length if p.length is not None else p.depth, p.direction or "Z",
+            )
+        elif ftype == "plane_offset":
+            p = feature.parameters
+            step = PlaneOffsetStep(feature.id, ftype, p.reference, p.offset)
+        else:
+            step = GenericStep(feature.id, ftype, _freeze(feature.parameters))
+        index[feature.id] = len(steps)
+        steps.append(step)
+
+    return ExecutionPlan(d_file.part.name, d_file.meta.units, tuple(steps))
@@ -0,0 +1,190 @@
+import copy
+
+import pytest
+
+from src.bridge import CatiaBridge
+from src.custom_types import DFile
+from src.planner import PlanError, RectanglePlan, compile_plan
+
+BASE = {
+    "meta": {"cad_system": "CATIA_V5", "units": "mm", "design_mode": "parametric"},
+    "part": {"name": "cube", "origin": [0, 0, 0], "axis_system": "default"},
+    "features": [
+        {
+            "id": "sketch_1",
+            "type": "sketch",
+            "sketch_plane": "XY",
+            "parameters": {"circle": {"center": [0, 0], "radius": 5}},
+        },
+        {
+            "id": "pad_1",
+            "type": "pad",
+            "sketch": "sketch_1",
+            "parameters": {"length": 10},
+        },
+    ],
+    "update_order": ["sketch_1", "pad_1"],
+}
+
+
+def d_file(**changes):
+    d = copy.deepcopy(BASE)
+    d.update(changes)
+    return d
+
+
+def error_locs(d):
+    with pytest.raises(PlanError) as info:
+        compile_plan(d)
+    return [e["loc"] for e in info.value.errors()]
+
+
+def error_message(d):
+    with pytest.raises(PlanError) as info:
+        compile_plan(d)
+    return str(info.value)
+
+
+def test_compiles_pre_cast_plan():
+    plan = compile_plan(d_file())
+    sketch, pad = plan.steps
+    assert plan.part_name == "cube"
+    assert sketch.circle == (0.0, 0.0, 5.0)
+    assert isinstance(sketch.circle.radius, float)
+    assert pad.length == 10.0 and pad.sketch_index == 0
+
+
+def test_bad_radius_is_rejected():
+    d = d_file()
+    d["features"][0]["parameters"]["circle"]["radius"] = "big"
+    assert error_locs(d) == [("features", 0, "sketch", "parameters", "circle", "radius")]
+
+
+@pytest.mark.parametrize("params", [
+    {"circle": {"center": [0, 0], "radius": -4}},
+    {"rectangle": {"center": [0, 0], "width": -4, "height": 2}},
+    {"rectangle": {"center": [0, 0], "width": 4, "height": 0}},
+    {"rectangle": {"center": [0, 0], "width": 4}},
+])
+def test_non_positive_or_incomplete_sketch_is_rejected(params):
+    d = d_file()
+    d["features"][0]["parameters"] = params
+    assert error_locs(d)[0][:4] == ("features", 0, "sketch", "parameters")
+
+
+@pytest.mark.parametrize("params", [{"length": 0}, {"depth": -1}])
+def test_non_positive_length_is_rejected(params):
+    d = d_file()
+    d["features"][1]["parameters"] = params
+    assert error_locs(d)[0][:4] == ("features", 1, "pad", "parameters")
+
+
+def test_missing_length_is_rejected():
+    d = d_file()
+    d["features"][1]["parameters"] = {"direction": "Z"}
+    assert error_locs(d) == [("features", 1, "pad", "parameters")]
+
+
+def test_depth_is_accepted_as_length():
+    d = d_file()
+    d["features"][1]["parameters"] = {"depth": 7}
+    assert compile_plan(d).steps[1].length == 7.0
+
+
+@pytest.mark.parametrize("rectangle", [
+    {"corner1": [10, 0], "corner2": [0, 4]},
+    {"center": [5, 2], "width": 10, "height": 4},
+])
+def test_rectangle_is_normalized(rectangle):
+    d = d_file()
+    d["features"][0]["parameters"] = {"rectangle": rectangle}
+    assert compile_plan(d).steps[0].rectangle == RectanglePlan(0.0, 0.0, 10.0, 4.0)
+
+
+def test_duplicate_id_is_rejected():
+    d = d_file()
+    d["features"].append(copy.deepcopy(d["features"][1]))
+    assert "features[2].id: duplicate feature ID 'pad_1'" in error_message(d)
+
+
+def test_missing_sketch_reference_is_rejected():
+    d = d_file()
+    d["features"][1]["sketch"] = "sketch_9"
+    assert "features[1].sketch: 'sketch_9' is not a sketch feature" in error_message(d)
+
+
+def test_sketch_after_solid_is_rejected():
+    for update_order in (["pad_1", "sketch_1"], ["pad_1"]):
+        message = error_message(d_file(update_order=update_order))
+        assert "features[1].sketch: sketch 'sketch_1' must run before 'pad_1'" in message
+
+
+def test_update_order_is_followed():
+    d = d_file(update_order=["sketch_1", "pad_1"])
+    d["features"].reverse()
+    assert [s.id for s in compile_plan(d).steps] == ["sketch_1", "pad_1"]
+
+
+@pytest.mark.parametrize("changes", [
+    {"meta": None},
+    {"part": None},
+    {"update_order": [["x"]]},
+    {"relations": "none"},
+])
+def test_schema_errors_are_rejected(changes):
+    d = d_file(**changes)
+    for key, value in changes.items():
+        if value is None:
+            del d[key]
+    with pytest.raises(PlanError):
+        compile_plan(d)
+
+
+def test_non_string_sketch_plane_and_direction_are_rejected():
+    d = d_file()
+    d["features"][0]["sketch_plane"] = 3
+    d["features"][1]["parameters"]["direction"] = 5
+    assert error_locs(d) == [("features", 0, "sketch", "sketch_plane"), ("features", 1, "pad", "parameters", "direction")]
+
+
+def test_generic_parameters_are_frozen():
+    d = d_file()
+    d["features"].append({"id": "rib_1", "type": "rib", "parameters": {"path": {"points": [1, 2]}}})
+    d["update_order"].append("rib_1")
+    params = compile_plan(d).steps[2].parameters
+    with pytest.raises(TypeError):
+        params["path"]["points"] = []
+    assert params["path"]["points"] == (1, 2)
+
+
+def test_execute_accepts_d_file(capsys):
+    logs = CatiaBridge(mode="mock").execute(DFile(**d_file()))
+    assert logs == []
+    out = capsys.readouterr().out
+    assert "[MOCK] Executing Feature: pad (ID: pad_1) Params: {'sketch': 'sketch_1'" in out
+
+
+def test_pad_uses_resolved_sketch():
+    class Fake:
+        def __init__(self, **attrs):
+            self.__dict__.update(attrs)
+
+    pads = []
+    sketch = Fake(factory_2d=Fake(create_circle=lambda *a: None),
+                  open_edition=lambda: None, close_edition=lambda: None)
+    bridge = CatiaBridge(mode="mock")
+    bridge.mode = "real"
+    bridge.part = Fake(
+        origin_elements=Fake(plane_xy="XY"),
+        main_body=Fake(sketches=Fake(add=lambda ref: sketch)),
+        update=lambda: None,
+    )
+    bridge.sf = Fake(add_new_pad=lambda s, length: pads.append((s, length)) or Fake())
+    assert bridge.execute(compile_plan(d_file())) == []
+    assert pads == [(sketch, 10.0)]
+
+
+def test_execute_feature_without_index(capsys):
+    step = compile_plan(d_file()).steps[0]
+    assert CatiaBridge(mode="mock").execute_feature(step) is None
+    assert "Params: {'plane': 'XY', 'circle': CirclePlan(cx=0.0, cy=0.0, radius=5.0)}" in capsys.readouterr().out